@@ -1,22 +1,233 @@
 import json
 import os
 import re
+import shutil
 import argparse
 from pathlib import Path
 import time
 import random
+import threading
 import requests
 import urllib.parse
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# ijson lets us stream large export files without loading the whole
+# document into memory; fall back to json.load if it isn't installed.
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# orjson parses whole documents several times faster than the stdlib; used
+# for the non-streaming fallback when ijson is unavailable.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# httpx can multiplex many downloads over a few HTTP/2 connections,
+# avoiding a TCP+TLS handshake per connection; fall back to requests.
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# The 'url_private_download' values live at files[*].url_private_download on
+# each message; exports may have a list or a single dict at the root.
+_URL_PREFIXES = (
+    "item.files.item.url_private_download",
+    "files.item.url_private_download",
+)
+
+# Errors raised for malformed JSON by either parser
+_JSON_ERRORS = (json.JSONDecodeError,) if ijson is None else (
+    json.JSONDecodeError,
+    ijson.JSONError,
+)
+
+# Slack file IDs appear in URL paths as */TAC060NK1-F08FGTZMQ9W/download/*
+_ID_RE = re.compile(r"/([A-Z0-9]+)-([A-Z0-9]+)/download/")
+
+# Slack download URLs have a rigid .../<TEAM>-<FILE>/download/<filename>
+# shape; one search extracts the team, file ID, and filename in a single
+# pass without urlparse
+_SLACK_RE = re.compile(r"/([A-Z0-9]+)-([A-Z0-9]+)/download/([^/?#]+)")
+
+# Bound once for the URL-parsing hot loop, skipping the attribute lookups
+# that would otherwise repeat per URL
+_slack_search = _SLACK_RE.search
+_unquote = urllib.parse.unquote
+
+# Characters stripped from filenames; everything outside alphanumerics
+# (plus underscore via \w) and "._- " is removed
+_UNSAFE_FILENAME_RE = re.compile(r"[^\w.\- ]")
+
+# Download concurrency and politeness settings
+_MAX_WORKERS = 8
+_REQUEST_INTERVAL = 0.5  # minimum seconds between request starts
+
+
+class _RateLimiter:
+    """
+    Space out request start times across worker threads so concurrent
+    downloads stay polite to the server without idling between them.
+    """
+
+    def __init__(self, min_interval):
+        self._min_interval = min_interval
+        self._next_time = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_time)
+            self._next_time = start + self._min_interval
+        delay = start - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+def _make_client():
+    """
+    Build the shared HTTP client used by all download workers. Prefer httpx
+    with HTTP/2 so concurrent downloads multiplex over one connection; fall
+    back to a pooled requests.Session when httpx (or its h2 extra) is not
+    installed.
+    """
+    if httpx is not None:
+        limits = httpx.Limits(max_connections=32, max_keepalive_connections=32)
+        try:
+            return httpx.Client(
+                http2=True, limits=limits, timeout=30, follow_redirects=True
+            )
+        except ImportError:
+            # http2 support needs the 'h2' package; plain HTTP/1.1 with
+            # keep-alive still beats a connection per request
+            return httpx.Client(
+                limits=limits, timeout=30, follow_redirects=True
+            )
+    return _make_session()
+
+
+def _make_session():
+    """
+    Build a requests.Session with a shared connection pool and transport-level
+    retries, so downloads reuse keep-alive connections instead of paying a new
+    TCP+TLS handshake per file.
+    """
+    session = requests.Session()
+    retry = Retry(
+        total=3,
+        backoff_factor=2,
+        status_forcelist=[429, 500, 502, 503, 504],
+    )
+    adapter = HTTPAdapter(
+        pool_connections=16, pool_maxsize=16, max_retries=retry
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _retry_after_seconds(exc):
+    """
+    If exc is an HTTP 429 error carrying a numeric Retry-After header,
+    return that delay in seconds; otherwise return None.
+    """
+    status_errors = (requests.exceptions.HTTPError,)
+    if httpx is not None:
+        status_errors += (httpx.HTTPStatusError,)
+    if not isinstance(exc, status_errors):
+        return None
+    response = exc.response
+    if response is None or response.status_code != 429:
+        return None
+    try:
+        return float(response.headers.get("Retry-After", ""))
+    except ValueError:
+        return None
 
 
-def extract_urls_from_json(file_path, url_file="extracted_urls.txt"):
+def _download_one(session, limiter, current_url, file_path, file_name, max_retries=3):
+    """
+    Download a single URL to file_path, retrying on failure.
+
+    Returns:
+        bool: True if the download succeeded, False otherwise
+    """
+    retry_count = 0
+    print(f"Downloading {file_name} from {current_url[:60]}...")
+
+    while retry_count <= max_retries:
+        try:
+            # Wait for our politeness slot before hitting the server
+            limiter.wait()
+
+            # Download to a '.part' staging file and rename into place,
+            # streaming in 1 MiB chunks rather than paying a Python call
+            # per 8 KiB. The atomic rename means a crashed download never
+            # leaves a half-file that the skip-existing check would treat
+            # as complete.
+            tmp_path = file_path.with_suffix(file_path.suffix + ".part")
+            if httpx is not None and isinstance(session, httpx.Client):
+                with session.stream("GET", current_url) as response:
+                    response.raise_for_status()
+                    with open(tmp_path, "wb", buffering=1 << 20) as f:
+                        for chunk in response.iter_bytes(1 << 20):
+                            f.write(chunk)
+            else:
+                response = session.get(current_url, stream=True, timeout=30)
+                response.raise_for_status()  # Raise an exception for 4xx/5xx status codes
+                with open(tmp_path, "wb", buffering=1 << 20) as f:
+                    shutil.copyfileobj(response.raw, f, length=1 << 20)
+            os.replace(tmp_path, file_path)
+
+            print(f"Successfully downloaded {file_name}")
+            return True
+
+        except Exception as e:
+            retry_count += 1
+
+            if retry_count <= max_retries:
+                # If the server is throttling us, honor its Retry-After
+                # (plus jitter) instead of the flat backoff
+                retry_after = _retry_after_seconds(e)
+                if retry_after is not None:
+                    wait_time = retry_after + random.uniform(0, 1)
+                elif retry_count < max_retries:
+                    # Wait 30 seconds for first and second failure
+                    wait_time = 30
+                else:
+                    # Wait 90 seconds for third failure
+                    wait_time = 90
+
+                print(f"Download failed: {str(e)}")
+                print(
+                    f"Retry attempt {retry_count}/{max_retries} in {wait_time} seconds..."
+                )
+                time.sleep(wait_time)
+            else:
+                print(f"Failed to download after {max_retries} attempts: {str(e)}")
+                return False
+
+    return False
+
+
+def extract_urls_from_json(file_path, url_file="extracted_urls.txt", url_out=None):
     """
     Parse a JSON file and extract all 'url_private_download' values from the 'files' property.
     Append these URLs to a text file in the same directory as the input file.
 
     Args:
         file_path (str or Path): Path to the JSON file to parse
+        url_file (str): Name of the URL file to append to when no handle is given
+        url_out (file object, optional): Already-open text handle to write URLs
+            to; lets callers processing many JSON files open the output once
+            instead of paying an open/close per input file
 
     Returns:
         int: Number of URLs extracted and saved
@@ -27,11 +238,48 @@ def extract_urls_from_json(file_path, url_file="extracted_urls.txt"):
     # Create output file path in the same directory
     output_file = path.parent / url_file
 
-    # Read and parse the JSON file
+    # Extract URLs
+    extracted_urls = []
+
+    # Read and parse the JSON file. Prefer streaming with ijson so only the
+    # URL strings are materialized instead of the whole document tree.
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-    except json.JSONDecodeError:
+        if ijson is not None:
+            with open(path, "rb", buffering=1 << 20) as f:
+                for prefix, event, value in ijson.parse(f):
+                    if event == "string" and prefix in _URL_PREFIXES:
+                        extracted_urls.append(value)
+        else:
+            with open(path, "rb") as f:
+                raw = f.read()
+            # orjson has no load(); parse the bytes in one call
+            if orjson is not None:
+                data = orjson.loads(raw)
+            else:
+                data = json.loads(raw)
+
+            # Handle both list and dictionary JSON structures
+            if isinstance(data, list):
+                items = data
+            else:
+                items = [data]
+
+            # Process each item in the JSON
+            for item in items:
+                if not isinstance(item, dict):
+                    continue
+
+                # Check if the item has a 'files' property
+                if "files" in item and isinstance(item["files"], list):
+                    for file_info in item["files"]:
+                        if (
+                            isinstance(file_info, dict)
+                            and "url_private_download" in file_info
+                        ):
+                            extracted_urls.append(
+                                file_info["url_private_download"]
+                            )
+    except _JSON_ERRORS:
         print(f"Error: {file_path} contains invalid JSON")
         return 0
     except FileNotFoundError:
@@ -41,78 +289,69 @@ def extract_urls_from_json(file_path, url_file="extracted_urls.txt"):
         print(f"Error processing {file_path}: {str(e)}")
         return 0
 
-    # Extract URLs
-    extracted_urls = []
-
-    # Handle both list and dictionary JSON structures
-    if isinstance(data, list):
-        items = data
-    else:
-        items = [data]
-
-    # Process each item in the JSON
-    for item in items:
-        if not isinstance(item, dict):
-            continue
-
-        # Check if the item has a 'files' property
-        if "files" in item and isinstance(item["files"], list):
-            for file_info in item["files"]:
-                if isinstance(file_info, dict) and "url_private_download" in file_info:
-                    extracted_urls.append(file_info["url_private_download"])
-
-    # Append URLs to output file
+    # Append URLs to the output in a single write
     if extracted_urls:
-        with open(output_file, "a", encoding="utf-8") as f:
-            for url in extracted_urls:
-                f.write(f"{url}\n")
+        payload = "\n".join(extracted_urls) + "\n"
+        if url_out is not None:
+            url_out.write(payload)
+        else:
+            with open(output_file, "a", encoding="utf-8") as f:
+                f.write(payload)
 
     return len(extracted_urls)
 
 
-def process_url_file(urls_file_path):
-    """
-    Process a file containing URLs:
-    1. Remove duplicate URLs
-    2. Identify duplicate filenames
-    3. For duplicate filenames, prepend the ID from the URL to make them unique
+# Per-worker-process output handle, opened lazily by _extract_worker so the
+# temp file is opened once per worker rather than once per JSON file
+_worker_url_out = None
 
-    Args:
-        urls_file_path (str or Path): Path to the file containing URLs
 
-    Returns:
-        dict: Dictionary with two keys:
-            'unique_urls': List of unique URLs
-            'filename_mapping': Dict mapping URLs to their unique filenames
+def _extract_worker(json_path, url_file="extracted_urls.txt"):
     """
-    urls_path = Path(urls_file_path)
+    Parallel-parse worker: extract URLs from one JSON file, writing to a
+    per-process temp file so workers never contend on the output file.
+    """
+    global _worker_url_out
+    if _worker_url_out is None:
+        tmp_path = Path(json_path).parent / f"{url_file}.{os.getpid()}.tmp"
+        _worker_url_out = open(
+            tmp_path, "a", encoding="utf-8", buffering=1 << 20
+        )
+    count = extract_urls_from_json(json_path, url_out=_worker_url_out)
+    _worker_url_out.flush()
+    return count
 
-    if not urls_path.exists():
-        print(f"Error: URL file {urls_path} not found")
-        return {"unique_urls": [], "filename_mapping": {}}
 
-    # Read URLs from file
-    try:
-        with open(urls_path, "r", encoding="utf-8") as f:
-            urls = [line.strip() for line in f if line.strip()]
-    except Exception as e:
-        print(f"Error reading URL file: {str(e)}")
-        return {"unique_urls": [], "filename_mapping": {}}
+def _merge_worker_outputs(directory, url_file="extracted_urls.txt"):
+    """
+    Concatenate the per-worker temp files into the final URL file and
+    remove them.
+    """
+    output_file = Path(directory) / url_file
+    with open(output_file, "ab") as out:
+        for tmp in sorted(Path(directory).glob(f"{url_file}.*.tmp")):
+            with open(tmp, "rb") as src:
+                shutil.copyfileobj(src, out, 1 << 20)
+            tmp.unlink()
 
-    # Remove duplicates while preserving order
-    unique_urls = []
-    seen = set()
-    for url in urls:
-        if url not in seen:
-            seen.add(url)
-            unique_urls.append(url)
 
-    print(f"Found {len(unique_urls)} unique URLs out of {len(urls)} total")
+def _parse_slack_url(url):
+    """
+    Extract the filename pieces and file ID from a download URL.
 
-    # Extract filenames and IDs from URLs
-    url_info = []
-    for url in unique_urls:
-        # Parse the URL to extract filename
+    Args:
+        url (str): A Slack file download URL
+
+    Returns:
+        tuple: (original_filename, base_name, extension, file_id)
+    """
+    # Fast path: Slack-shaped URLs yield filename and ID in one search
+    slack_match = _slack_search(url)
+    if slack_match:
+        filename = _unquote(slack_match.group(3))
+        file_id = f"-{slack_match.group(2)}"
+    else:
+        # Fall back to full URL parsing for anything else
         parsed_url = urllib.parse.urlparse(url)
         path_parts = parsed_url.path.split("/")
 
@@ -131,60 +370,88 @@ def process_url_file(urls_file_path):
                 filename = "file.bin"  # Default fallback
 
         # Extract ID from the path
-        # Format: */TAC060NK1-F08FGTZMQ9W/download/*
-        id_pattern = r"/([A-Z0-9]+)-([A-Z0-9]+)/download/"
-        id_match = re.search(id_pattern, parsed_url.path)
+        id_match = _ID_RE.search(parsed_url.path)
 
         file_id = ""
         if id_match:
             file_id = f"-{id_match.group(2)}"
 
-        # Handle filenames with no extension
-        filename_parts = filename.rsplit(".", 1) if "." in filename else [filename, ""]
-        base_name = filename_parts[0]
-        extension = (
-            f".{filename_parts[1]}"
-            if len(filename_parts) > 1 and filename_parts[1]
-            else ""
-        )
+    # Handle filenames with no extension; rpartition avoids the list
+    # allocation rsplit would make per URL
+    base, dot, ext = filename.rpartition(".")
+    base_name = base if dot else filename
+    extension = f".{ext}" if dot and ext else ""
 
-        url_info.append(
-            {
-                "url": url,
-                "original_filename": filename,
-                "base_name": base_name,
-                "extension": extension,
-                "id": file_id,
-            }
-        )
+    return filename, base_name, extension, file_id
+
+
+def process_url_file(urls_file_path):
+    """
+    Process a file containing URLs:
+    1. Remove duplicate URLs
+    2. Identify duplicate filenames
+    3. For duplicate filenames, prepend the ID from the URL to make them unique
+
+    Args:
+        urls_file_path (str or Path): Path to the file containing URLs
+
+    Returns:
+        dict: Dictionary with two keys:
+            'unique_urls': List of unique URLs
+            'filename_mapping': Dict mapping URLs to their unique filenames
+    """
+    urls_path = Path(urls_file_path)
 
-    # Count occurrences of each filename
-    filename_counter = Counter([info["original_filename"] for info in url_info])
+    if not urls_path.exists():
+        print(f"Error: URL file {urls_path} not found")
+        return {"unique_urls": [], "filename_mapping": {}}
+
+    # Read URLs from file: slurp the raw bytes in one read and split them
+    # once, bypassing the text I/O layer's per-line decode overhead.
+    try:
+        with open(urls_path, "rb") as f:
+            urls = [
+                stripped.decode("utf-8")
+                for line in f.read().splitlines()
+                if (stripped := line.strip())
+            ]
+    except Exception as e:
+        print(f"Error reading URL file: {str(e)}")
+        return {"unique_urls": [], "filename_mapping": {}}
+
+    # Remove duplicates while preserving order (dicts keep insertion order)
+    unique_urls = list(dict.fromkeys(urls))
+
+    print(f"Found {len(unique_urls)} unique URLs out of {len(urls)} total")
+
+    # First pass: count occurrences of each filename so duplicates can be
+    # detected without keeping per-URL records around
+    filename_counter = Counter()
+    for url in unique_urls:
+        filename_counter[_parse_slack_url(url)[0]] += 1
 
-    # Create filename mapping for each URL
+    # Second pass: build the mapping, disambiguating duplicate filenames
+    # with the file ID and counting modifications as we go
     filename_mapping = {}
-    for info in url_info:
+    modified_count = 0
+    for url in unique_urls:
+        filename, base_name, extension, file_id = _parse_slack_url(url)
+
         # If this filename appears more than once, use the ID to make it unique
-        if filename_counter[info["original_filename"]] > 1:
-            unique_filename = f"{info['base_name']}{info['id']}{info['extension']}"
+        if filename_counter[filename] > 1:
+            unique_filename = f"{base_name}{file_id}{extension}"
         else:
-            unique_filename = info["original_filename"]
+            unique_filename = filename
 
-        filename_mapping[info["url"]] = unique_filename
+        if unique_filename != filename:
+            modified_count += 1
 
-    # Write back deduplicated URLs
+        filename_mapping[url] = unique_filename
+
+    # Write back deduplicated URLs through the buffered file object,
+    # without first building one big joined string
     with open(urls_path, "w", encoding="utf-8") as f:
-        for url in unique_urls:
-            f.write(f"{url}\n")
-
-    # Count how many filenames were modified
-    modified_count = sum(
-        1
-        for orig, new in zip(
-            [info["original_filename"] for info in url_info], filename_mapping.values()
-        )
-        if orig != new
-    )
+        f.writelines(f"{url}\n" for url in unique_urls)
 
     print(f"Modified {modified_count} filenames to ensure uniqueness")
 
@@ -196,6 +463,11 @@ def download_files_from_urls(urls_file_path, download_folder):
     Process a file containing URLs, download the files with random delays,
     and remove successfully downloaded URLs from the file.
 
+    Progress is persisted by appending each processed URL to a sibling
+    '.done' file instead of rewriting the whole URL file per download;
+    on the next run the '.done' file is read back so already-processed
+    URLs are skipped. The URL file itself is rewritten once at the end.
+
     Args:
         urls_file_path (str or Path): Path to the file containing URLs
 
@@ -208,6 +480,21 @@ def download_files_from_urls(urls_file_path, download_folder):
     filename_mapping = url_data["filename_mapping"]
 
     urls_path = Path(urls_file_path)
+    done_path = urls_path.with_suffix(urls_path.suffix + ".done")
+
+    # Read back progress from a previous interrupted run
+    done_urls = set()
+    failed_urls = []
+    if done_path.exists():
+        with open(done_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                if line.startswith("[FAILED] "):
+                    line = line[len("[FAILED] ") :]
+                    failed_urls.append(line)
+                done_urls.add(line)
 
     # Create downloads directory in the same folder as the URLs file
     download_dir = urls_path.parent / download_folder
@@ -216,100 +503,95 @@ def download_files_from_urls(urls_file_path, download_folder):
     # Track statistics
     success_count = 0
     fail_count = 0
-    retry_count = 0
-    max_retries = 3
-    skipped = 0
     skipped_count = 0
 
-    # Process each URL
-    remaining_urls = unique_urls.copy()
-    while remaining_urls:
-        current_url = remaining_urls[0]
-
-        # Get the unique filename for this URL
-        file_name = filename_mapping.get(current_url)
-        if not file_name:
-            # Fallback if no mapping exists (shouldn't happen)
-            parsed_url = urllib.parse.urlparse(current_url)
-            file_name = os.path.basename(parsed_url.path)
-            if not file_name or file_name == "download":
-                file_name = f"download_{hash(current_url) % 10000}.bin"
-
-        # Clean up filename to ensure it's valid
-        file_name = "".join(c for c in file_name if c.isalnum() or c in "._- ")
-        file_path = Path(download_dir / file_name)
-
-        if file_path.exists():
-            #print(f"File {file_name} already exists, skipping download.")
-            download_success = True
-            remaining_urls.pop(0)
-            skipped = skipped + 1
-            skipped_count = skipped_count + 1
-        else:
-            if skipped > 0:
-                print(f"Skipped {skipped} files that already exist.")
-                skipped = 0
-            # Attempt download with retry logic
-            retry_count = 0
-            print(f"Downloading {file_name} from {current_url[:60]}...")
-            download_success = False
-
-        while retry_count <= max_retries and not download_success:
-            try:
-                # Add a random delay between 1-5 seconds
-                delay = random.uniform(1, 5)
-                time.sleep(delay)
-
-                # Download the file
-                response = requests.get(current_url, stream=True, timeout=30)
-                response.raise_for_status()  # Raise an exception for 4xx/5xx status codes
+    session = _make_client()
+    limiter = _RateLimiter(_REQUEST_INTERVAL)
 
-                # Save the file
-                with open(file_path, "wb") as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        if chunk:
-                            f.write(chunk)
+    # Process each URL, appending progress to the '.done' file as we go.
+    # O_APPEND makes each one-line write atomic, so worker results can be
+    # recorded without a lock; durability is paid once via fsync at the end.
+    done_fd = os.open(
+        done_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644
+    )
+    try:
 
-                print(f"Successfully downloaded {file_name}")
-                download_success = True
-                success_count += 1
-
-                # Remove successful URL from the list and file
-                remaining_urls.pop(0)
-
-                # Update the URLs file
-                with open(urls_path, "w", encoding="utf-8") as f:
-                    for url in remaining_urls:
-                        f.write(f"{url}\n")
-
-            except Exception as e:
-                retry_count += 1
-
-                if retry_count <= max_retries:
-                    if retry_count < max_retries:
-                        # Wait 30 seconds for first and second failure
-                        wait_time = 30
-                    else:
-                        # Wait 90 seconds for third failure
-                        wait_time = 90
-
-                    print(f"Download failed: {str(e)}")
-                    print(
-                        f"Retry attempt {retry_count}/{max_retries} in {wait_time} seconds..."
-                    )
-                    time.sleep(wait_time)
+        def record(line):
+            os.write(done_fd, f"{line}\n".encode("utf-8"))
+
+        # One directory read up front instead of a stat() call per URL;
+        # '.part' files are unfinished downloads and don't count
+        existing_files = {
+            entry.name
+            for entry in os.scandir(download_dir)
+            if not entry.name.endswith(".part")
+        }
+
+        # Resolve filenames and skip already-downloaded files up front so
+        # only real work is handed to the thread pool
+        to_download = []
+        for current_url in unique_urls:
+            if current_url in done_urls:
+                continue
+
+            # Get the unique filename for this URL
+            file_name = filename_mapping.get(current_url)
+            if not file_name:
+                # Fallback if no mapping exists (shouldn't happen)
+                parsed_url = urllib.parse.urlparse(current_url)
+                file_name = os.path.basename(parsed_url.path)
+                if not file_name or file_name == "download":
+                    file_name = f"download_{hash(current_url) % 10000}.bin"
+
+            # Clean up filename to ensure it's valid
+            file_name = _UNSAFE_FILENAME_RE.sub("", file_name)
+            file_path = Path(download_dir / file_name)
+
+            if file_name in existing_files:
+                #print(f"File {file_name} already exists, skipping download.")
+                record(current_url)
+                skipped_count = skipped_count + 1
+                continue
+
+            # Claim the name so a second URL resolving to the same
+            # filename is treated as already present rather than racing
+            # this one for the same staging file
+            existing_files.add(file_name)
+            to_download.append((current_url, file_path, file_name))
+
+        if skipped_count > 0:
+            print(f"Skipped {skipped_count} files that already exist.")
+
+        # Download in parallel over the shared session
+        with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as executor:
+            futures = {
+                executor.submit(
+                    _download_one, session, limiter, url, file_path, file_name
+                ): url
+                for url, file_path, file_name in to_download
+            }
+
+            for future in as_completed(futures):
+                current_url = futures[future]
+                if future.result():
+                    success_count += 1
+                    record(current_url)
                 else:
-                    print(f"Failed to download after {max_retries} attempts: {str(e)}")
                     fail_count += 1
-                    remaining_urls.pop(0)
+                    failed_urls.append(current_url)
+                    # Keep the failed URL but mark it
+                    record(f"[FAILED] {current_url}")
 
-                    # Update the URLs file, marking failed URL with [FAILED] prefix
-                    with open(urls_path, "w", encoding="utf-8") as f:
-                        f.write(
-                            f"[FAILED] {current_url}\n"
-                        )  # Keep the failed URL but mark it
-                        for url in remaining_urls:
-                            f.write(f"{url}\n")
+        # Single durability point for the whole run
+        os.fsync(done_fd)
+    finally:
+        os.close(done_fd)
+
+    # Every URL was processed: collapse progress back into the URLs file,
+    # keeping only the failed URLs (marked), and drop the '.done' file
+    with open(urls_path, "w", encoding="utf-8") as f:
+        f.writelines(f"[FAILED] {url}\n" for url in failed_urls)
+    done_path.unlink(missing_ok=True)
 
     print(f"\nDownload summary:")
     print(f"  Successful downloads: {success_count}")
@@ -364,8 +646,13 @@ def main():
     if args.parse:
         try:
             if input_path.is_dir():
-                # Process all JSON files in the directory (not subdirectories)
-                json_files = list(input_path.glob("*.json"))
+                # Process all JSON files in the directory (not subdirectories),
+                # enumerating with os.scandir to skip per-entry Path objects
+                json_files = sorted(
+                    entry.path
+                    for entry in os.scandir(input_path)
+                    if entry.is_file() and entry.name.endswith(".json")
+                )
 
                 if not json_files:
                     print(f"No JSON files found in directory: {input_path}")
@@ -373,10 +660,18 @@ def main():
 
                 print(f"Processing {len(json_files)} JSON files in {input_path}")
 
-                for json_file in json_files:
-                    count = extract_urls_from_json(json_file)
-                    total_urls += count
-                    print(f"Extracted {count} URLs from {json_file.name}")
+                # Parse files across all cores; each worker process appends
+                # to its own temp file, merged into the URL file afterwards
+                with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+                    for json_file, count in zip(
+                        json_files, executor.map(_extract_worker, json_files)
+                    ):
+                        total_urls += count
+                        print(
+                            f"Extracted {count} URLs from {os.path.basename(json_file)}"
+                        )
+
+                _merge_worker_outputs(input_path)
 
                 print(f"Total URLs extracted: {total_urls}")
 